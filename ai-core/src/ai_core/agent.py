@@ -1,24 +1,57 @@
+import asyncio
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 import json
 from pathlib import Path
 
 from fastmcp import Client
-from liquid import render
+from liquid import parse
 from openai.types.chat import (
     ChatCompletionMessageToolCallParam,
     ChatCompletionToolMessageParam,
+    ChatCompletionToolParam,
 )
 import pendulum
 
 from ai_core.config import AgentConfig
 from ai_core.litelllm_completion import (
+    build_response_from_chunks,
     get_additional_llm_kwargs,
-    litellm_completion,
+    litellm_completion_stream,
+    strip_streaming_thinking,
     strip_thinking,
 )
 from ai_core.mcp_utils import mcp_tool_to_openai, parse_tool_call_content
 from ai_core.prompts import AGENT_SYSTEM_PROMPT
-from ai_core.schemas import Message, MessageData, MessageHistory, create_message_data
+from ai_core.schemas import (
+    AssistantMessageChunk,
+    Message,
+    MessageData,
+    MessageHistory,
+    create_message_data,
+)
+
+# Number of streamed deltas to buffer before yielding an AssistantMessageChunk
+STREAM_CHUNK_DELTAS = 8
+
+
+# Parsed once, so compiling the system prompt only has to render it
+_SYSTEM_PROMPT_TEMPLATE = parse(AGENT_SYSTEM_PROMPT)
+
+
+@lru_cache(maxsize=64)
+def _render_system_prompt(
+    knowledge_cutoff: str,
+    current_date: str,
+    working_directory: Path,
+    mcp_instructions: str,
+) -> str:
+    return _SYSTEM_PROMPT_TEMPLATE.render(
+        knowledge_cutoff=knowledge_cutoff,
+        current_date=current_date,
+        working_directory=working_directory,
+        mcp_instructions=mcp_instructions,
+    )
 
 
 def _compile_system_prompt(
@@ -27,8 +60,7 @@ def _compile_system_prompt(
     working_directory: Path,
     mcp_instructions: str,
 ) -> str:
-    system_prompt = render(
-        AGENT_SYSTEM_PROMPT,
+    system_prompt = _render_system_prompt(
         knowledge_cutoff=knowledge_cutoff,
         current_date=pendulum.now(tz=timezone).format("YYYY-MM-DD"),
         working_directory=working_directory,
@@ -37,6 +69,43 @@ def _compile_system_prompt(
     return system_prompt
 
 
+def _unyielded_content(streamed_content: str, yielded_content: str) -> str:
+    """Returns the visible part of the streamed content that has not been yielded yet."""
+    return strip_streaming_thinking(streamed_content)[len(yielded_content) :]
+
+
+def _tool_error_message(
+    tool_call: ChatCompletionMessageToolCallParam, error: BaseException
+) -> ChatCompletionToolMessageParam:
+    error_message = f"Error executing tool call '{tool_call['function']['name']}': {error!s}\nEither try to call the tool again with different arguments to do something else."
+    return ChatCompletionToolMessageParam(
+        role="tool",
+        content=error_message,
+        tool_call_id=tool_call["id"],
+    )
+
+
+def batch_tool_calls(
+    tool_calls: list[ChatCompletionMessageToolCallParam], read_only_tools: set[str]
+) -> list[list[ChatCompletionMessageToolCallParam]]:
+    """Groups tool calls into batches that are safe to run concurrently.
+    Consecutive calls to read-only tools share a batch.
+    Any other tool call gets a batch of its own, so calls that modify state (e.g. editing a file) keep their order.
+    """
+    batches: list[list[ChatCompletionMessageToolCallParam]] = []
+    for tool_call in tool_calls:
+        is_read_only = tool_call["function"]["name"] in read_only_tools
+        if (
+            is_read_only
+            and batches
+            and batches[-1][0]["function"]["name"] in read_only_tools
+        ):
+            batches[-1].append(tool_call)
+        else:
+            batches.append([tool_call])
+    return batches
+
+
 class Agent:
     def __init__(
         self,
@@ -47,7 +116,13 @@ class Agent:
     ) -> None:
         self.mcp_client = mcp_client
         self.config = config
-        self.message_history = MessageHistory()
+        self.message_history = MessageHistory(
+            window_size=self.config.message_window_size
+        )
+        # The config is not changed after the Agent is created, so the kwargs are built once
+        self._llm_kwargs = get_additional_llm_kwargs(self.config.llm_config)
+        self._mcp_tools: list[ChatCompletionToolParam] | None = None
+        self._read_only_tools: set[str] = set()
 
         self.message_history.messages.append(
             Message(
@@ -63,6 +138,20 @@ class Agent:
             )
         )
 
+    async def get_mcp_tools(self) -> list[ChatCompletionToolParam]:
+        """Gets the MCP tools in the OpenAI format, listing them only on the first call.
+        The servers are composed once when the client is created, so the tools do not change for the life of the Agent.
+        """
+        if self._mcp_tools is None:
+            tools = await self.mcp_client.list_tools()
+            self._mcp_tools = [mcp_tool_to_openai(tool) for tool in tools]
+            self._read_only_tools = {
+                tool.name
+                for tool in tools
+                if tool.annotations and tool.annotations.readOnlyHint
+            }
+        return self._mcp_tools
+
     async def handle_tool_call(
         self, tool_call: ChatCompletionMessageToolCallParam
     ) -> ChatCompletionToolMessageParam:
@@ -85,24 +174,34 @@ class Agent:
             )
             return tool_message
         except Exception as e:
-            error_message = f"Error executing tool call '{tool_call['function']['name']}': {e!s}\nEither try to call the tool again with different arguments to do something else."
-            tool_message = ChatCompletionToolMessageParam(
-                role="tool",
-                content=error_message,
-                tool_call_id=tool_call["id"],
-            )
-            return tool_message
+            return _tool_error_message(tool_call, e)
+
+    async def handle_tool_calls(
+        self, tool_calls: list[ChatCompletionMessageToolCallParam]
+    ) -> list[ChatCompletionToolMessageParam]:
+        """Executes the tool calls concurrently, returning the tool messages in the same order."""
+        results = await asyncio.gather(
+            *(self.handle_tool_call(tool_call) for tool_call in tool_calls),
+            return_exceptions=True,
+        )
+        return [
+            _tool_error_message(tool_call, result)
+            if isinstance(result, BaseException)
+            else result
+            for tool_call, result in zip(tool_calls, results, strict=True)
+        ]
 
     async def turn(self, user_utterance: str) -> AsyncGenerator[MessageData, None]:
         """
         Executes an agentic loop that continues sending completion requests until
         there are no tool calls or MAX_STEPS is reached.
+        Assistant content is streamed as AssistantMessageChunk events, with thinking removed,
+        before the complete AssistantMessageData for each step is yielded.
 
         Args:
             message (Message): The initial user message to start the conversation.
         """
-        mcp_tools = await self.mcp_client.list_tools()
-        mcp_tools = [mcp_tool_to_openai(tool) for tool in mcp_tools]
+        mcp_tools = await self.get_mcp_tools()
         self.message_history.messages.append(
             Message(
                 chat_completion_message_param={
@@ -113,13 +212,35 @@ class Agent:
         )
 
         for _ in range(self.config.max_steps):
-            # Get the assistant response
-            response = await litellm_completion(
+            # Stream the assistant response, then rebuild the full message from the chunks
+            messages = self.message_history.get_messages()
+            chunks = []
+            streamed_content = ""
+            yielded_content = ""
+            pending_deltas = 0
+            async for chunk in litellm_completion_stream(
                 model=self.config.llm_config.model_name,
-                messages=self.message_history.get_messages(),
+                messages=messages,
                 tools=mcp_tools,
-                **get_additional_llm_kwargs(self.config.llm_config),
-            )
+                max_concurrent_requests=self.config.llm_config.max_concurrent_requests,
+                **self._llm_kwargs,
+            ):
+                chunks.append(chunk)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                streamed_content += delta
+                pending_deltas += 1
+                if pending_deltas >= STREAM_CHUNK_DELTAS:
+                    pending_deltas = 0
+                    if new_content := _unyielded_content(
+                        streamed_content, yielded_content
+                    ):
+                        yielded_content += new_content
+                        yield AssistantMessageChunk(content=new_content)
+            if new_content := _unyielded_content(streamed_content, yielded_content):
+                yield AssistantMessageChunk(content=new_content)
+            response = build_response_from_chunks(chunks)
             assistant_response = response.choices[0].message
             assistant_response["content"] = strip_thinking(
                 assistant_response.get("content")
@@ -133,11 +254,34 @@ class Agent:
             # Handle tool calls
             if not tool_calls:
                 break
-            for tool_call in tool_calls:
-                tool_message = await self.handle_tool_call(tool_call)
-                self.message_history.messages.append(
-                    Message(chat_completion_message_param=tool_message)
-                )
-                yield create_message_data(
-                    tool_call=tool_call, tool_message=tool_message
-                )
+            # Read-only tool calls run concurrently, the results are recorded in their original order
+            for batch in batch_tool_calls(tool_calls, self._read_only_tools):
+                tool_messages = await self.handle_tool_calls(batch)
+                for tool_call, tool_message in zip(batch, tool_messages, strict=True):
+                    self.message_history.messages.append(
+                        Message(chat_completion_message_param=tool_message)
+                    )
+                    yield create_message_data(
+                        tool_call=tool_call, tool_message=tool_message
+                    )
+
+
+async def batch_turn(
+    agents: list[Agent], user_utterances: list[str]
+) -> list[list[MessageData]]:
+    """Runs a turn on each agent with its utterance concurrently, returning the events of each turn.
+
+    Each agent needs its own message history, so pass separate Agent instances.
+    The completion requests still share the per-model concurrency limit.
+    Hosted models serve them in parallel, while a local Ollama mostly processes them one after another.
+    """
+
+    async def collect_turn(agent: Agent, user_utterance: str) -> list[MessageData]:
+        return [event async for event in agent.turn(user_utterance)]
+
+    return await asyncio.gather(
+        *(
+            collect_turn(agent, user_utterance)
+            for agent, user_utterance in zip(agents, user_utterances, strict=True)
+        )
+    )
@@ -1,21 +1,29 @@
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LLMConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model_name: str = "ollama_chat/qwen3:30b-a3b-q4_K_M"
     max_completion_tokens: int = 4000
     temperature: float = 0.7
     num_ctx: int | None = 32000
+    # Maximum completion requests in flight for the model, across all agents in the process
+    max_concurrent_requests: int = 8
 
 
 class PromptConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     knowledge_cutoff: str = "2024-10"
     timezone: str = "America/New_York"
 
 
 class MCPServerConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     identifier: str
     command: str
     args: list[str] = []
@@ -23,8 +31,13 @@ class MCPServerConfig(BaseModel):
 
 
 class AgentConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     max_steps: int = 25
 
+    # Number of recent messages to keep sending to the LLM. None sends the entire conversation.
+    message_window_size: int | None = None
+
     llm_config: LLMConfig = LLMConfig()
 
     prompt_config: PromptConfig = PromptConfig()
@@ -1,4 +1,8 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from functools import cache
 import re
+from types import ModuleType
 from typing import Any
 import warnings
 
@@ -6,31 +10,95 @@ from openai.types.chat import ChatCompletionToolParam
 
 from ai_core.config import LLMConfig
 
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", category=DeprecationWarning, module="pydantic")
-    from litellm import acompletion
+# litellm's httpx calls emit DeprecationWarnings, including while a stream is being consumed
+warnings.filterwarnings("ignore", category=DeprecationWarning, module="httpx")
 
+_THINK_PATTERN = re.compile(r"<think>.*?</think>", flags=re.DOTALL)
 
-async def litellm_completion(
+
+@cache
+def _import_litellm() -> ModuleType:
+    """Imports litellm on first use, since importing it takes over a second."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", category=DeprecationWarning, module="pydantic"
+        )
+        import litellm
+    return litellm
+
+
+# Limits the completion requests in flight per model, so concurrent agents queue here instead of at the provider.
+# Semaphores are bound to the event loop that first waits on them, so they are kept per running loop.
+_MODEL_SEMAPHORES: dict[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = {}
+
+
+def _get_model_semaphore(model: str, max_concurrent_requests: int) -> asyncio.Semaphore:
+    """Gets the semaphore of the model in the running event loop, the limit of the first request for a model is used."""
+    loop = asyncio.get_running_loop()
+    if loop not in _MODEL_SEMAPHORES:
+        # The semaphores reference their loop, so the ones of closed loops are dropped here instead of by a weak reference
+        for closed_loop in [key for key in _MODEL_SEMAPHORES if key.is_closed()]:
+            del _MODEL_SEMAPHORES[closed_loop]
+        _MODEL_SEMAPHORES[loop] = {}
+    loop_semaphores = _MODEL_SEMAPHORES[loop]
+    if model not in loop_semaphores:
+        loop_semaphores[model] = asyncio.Semaphore(max_concurrent_requests)
+    return loop_semaphores[model]
+
+
+async def litellm_completion_stream(
     model: str,
     messages: list[dict],
     tools: list[ChatCompletionToolParam] | None = None,
+    max_concurrent_requests: int = 8,
     **kwargs: Any,
-) -> Any:
-    if model.startswith("ollama") and "api_base" not in kwargs:
-        kwargs["api_base"] = "http://localhost:11434"
-
-    if not model.startswith("ollama"):
-        kwargs.pop("num_ctx", None)
-
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=DeprecationWarning, module="httpx")
-        response = await acompletion(
+) -> AsyncGenerator[Any, None]:
+    """Streams a completion from litellm, yielding the response chunks as they arrive.
+    The request counts towards the model's concurrency limit until the stream is consumed.
+    """
+    async with _get_model_semaphore(model, max_concurrent_requests):
+        response = await _import_litellm().acompletion(
             model=model,
             messages=messages,
             tools=tools,
+            stream=True,
             **kwargs,
         )
+        async for chunk in response:
+            yield chunk
+
+
+def _index_tool_calls(chunks: list[Any]) -> None:
+    """Give each streamed tool call its own index, which stream_chunk_builder merges the argument deltas by.
+    litellm's Ollama chunk parser gives every tool call index 0, so calls are told apart by their id.
+    Deltas without an id continue the last call that had their original index.
+    """
+    indices_by_id: dict[str, int] = {}
+    indices_by_original_index: dict[int, int] = {}
+    for chunk in chunks:
+        for choice in chunk.choices:
+            for tool_call in choice.delta.tool_calls or []:
+                if tool_call.id is not None:
+                    indices_by_id.setdefault(tool_call.id, len(indices_by_id))
+                    indices_by_original_index[tool_call.index] = indices_by_id[
+                        tool_call.id
+                    ]
+                tool_call.index = indices_by_original_index.get(
+                    tool_call.index, tool_call.index
+                )
+
+
+def build_response_from_chunks(chunks: list[Any]) -> Any:
+    """Rebuild the complete response from streamed chunks, merging the content and tool call argument deltas.
+    The messages are not passed on, since the usage litellm would count from them on the event loop is not used.
+
+    Raises:
+        ValueError: If the stream ended without returning any chunks.
+    """
+    _index_tool_calls(chunks)
+    response = _import_litellm().stream_chunk_builder(chunks)
+    if response is None:
+        raise ValueError("The LLM response stream ended without returning any content.")
     return response
 
 
@@ -38,18 +106,40 @@ def strip_thinking(content: str | None) -> str | None:
     """Strip out <think>thinking content</think> tags and their content from model output."""
     if not content or not isinstance(content, str):
         return content
-    pattern = r"<think>.*?</think>"
-    return re.sub(pattern, "", content, flags=re.DOTALL).strip()
+    if "<think>" not in content:
+        return content.strip()
+    return _THINK_PATTERN.sub("", content).strip()
+
+
+def strip_streaming_thinking(content: str) -> str:
+    """Like strip_thinking, but for content that is still streaming.
+    Everything from an unclosed <think> tag onwards is dropped, as is a partially received opening tag,
+    so the result only ever grows as more content arrives.
+    """
+    if "<think>" in content:
+        content = _THINK_PATTERN.sub("", content)
+    think_start = content.find("<think>")
+    if think_start != -1:
+        content = content[:think_start]
+    for i in range(len("<think>") - 1, 0, -1):
+        if content.endswith("<think>"[:i]):
+            content = content[:-i]
+            break
+    return content.lstrip()
 
 
 def get_additional_llm_kwargs(llm_config: LLMConfig) -> dict[str, Any]:
-    """Get the additional kwargs from the config."""
+    """Get the additional kwargs from the config, including the provider specific ones.
+    The provider is resolved here so the completion calls do not have to check the model name each time.
+    """
     addition_kwargs = {
         "max_completion_tokens": llm_config.max_completion_tokens,
         "temperature": llm_config.temperature,
     }
 
-    if llm_config.num_ctx is not None:
-        addition_kwargs["num_ctx"] = llm_config.num_ctx
+    if llm_config.model_name.startswith("ollama"):
+        addition_kwargs["api_base"] = "http://localhost:11434"
+        if llm_config.num_ctx is not None:
+            addition_kwargs["num_ctx"] = llm_config.num_ctx
 
     return addition_kwargs
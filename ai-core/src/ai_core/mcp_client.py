@@ -7,15 +7,74 @@ import mcp.types
 from pydantic import FileUrl
 
 from ai_core.agent import Agent
-from ai_core.config import AgentConfig
+from ai_core.config import AgentConfig, MCPServerConfig
+from ai_core.mcp_pool import MCPSessionPool
 from ai_core.mcp_servers.filesystem.server import mcp as filesystem_server
 from ai_core.mcp_servers.web.server import mcp as web_server
-from ai_core.schemas import AssistantMessageData, ToolMessageData
+from ai_core.schemas import AssistantMessageChunk, AssistantMessageData, ToolMessageData
+
+
+async def _probe_external_server(
+    server_config: MCPServerConfig, session_pool: MCPSessionPool
+) -> tuple[dict | None, str]:
+    """Connect to an external MCP server to get its info and instructions.
+
+    Returns:
+        The server info to mount it with, or None if the server could not be reached, and its instructions.
+    """
+    mcp_config = {
+        "mcpServers": {
+            server_config.identifier: {
+                "command": server_config.command,
+                "args": server_config.args,
+            }
+        }
+    }
 
+    # The pooled client is reused as the backend of the server's proxy
+    try:
+        pooled_client = await session_pool.acquire(server_config.identifier, mcp_config)
+        await pooled_client.ping()
+    except Exception as e:
+        print(
+            f"Warning: Failed to get info from {server_config.identifier}: {e}.\nServer not being added."
+        )
+        return None, ""
+
+    result = pooled_client.initialize_result
+    server_name = server_config.identifier
+    server_instructions = ""
+    if result and result.serverInfo:
+        server_name = result.serverInfo.name
+        server_instructions = result.instructions or ""
+    server_info = {
+        "client": pooled_client,
+        "name": server_name,
+        "prefix": server_config.prefix,
+    }
+    return server_info, server_instructions
+
+
+def _composition_key(config: AgentConfig) -> tuple:
+    """The parts of the config that determine the composed MCP server."""
+    return (
+        frozenset(config.native_mcp_servers),
+        tuple(
+            (
+                server_config.identifier,
+                server_config.command,
+                tuple(server_config.args),
+                server_config.prefix,
+            )
+            for server_config in config.mcp_servers
+        ),
+    )
 
-async def initialize_mcp_client(
-    workspace_path: Path, config: AgentConfig
-) -> tuple[Client, str]:
+
+async def _compose_mcp_servers(
+    config: AgentConfig, session_pool: MCPSessionPool
+) -> tuple[FastMCP, str]:
+    """Mount the enabled native and external MCP servers on a single server, returning it with their combined instructions."""
     instructions_parts = []
 
     # Collect instructions from enabled native servers
@@ -34,42 +93,22 @@ async def initialize_mcp_client(
                     f"### {display_name} Server\n{server.instructions}"
                 )
 
-    # Process all external MCP servers from config first to get their info
+    # Process all external MCP servers from config first to get their info.
+    # The servers are probed concurrently, the results are kept in config order.
+    probe_results = await asyncio.gather(
+        *(
+            _probe_external_server(server_config, session_pool)
+            for server_config in config.mcp_servers
+        )
+    )
     external_servers = []
-    for server_config in config.mcp_servers:
-        mcp_config = {
-            "mcpServers": {
-                server_config.identifier: {
-                    "command": server_config.command,
-                    "args": server_config.args,
-                }
-            }
-        }
-
-        # Connect to get server info
-        client_for_info = Client(mcp_config)
-        try:
-            async with client_for_info:
-                await client_for_info.ping()
-                result = client_for_info.initialize_result
-                server_name = server_config.identifier
-                if result and result.serverInfo:
-                    server_name = result.serverInfo.name
-                    server_instructions = result.instructions or ""
-                    if server_instructions:
-                        instructions_parts.append(
-                            f"## {server_name} Server\n{server_instructions}"
-                        )
-                external_servers.append(
-                    {
-                        "config": mcp_config,
-                        "name": server_name,
-                        "prefix": server_config.prefix,
-                    }
-                )
-        except Exception as e:
-            print(
-                f"Warning: Failed to get info from {server_config.identifier}: {e}.\nServer not being added."
+    for server_info, server_instructions in probe_results:
+        if server_info is None:
+            continue
+        external_servers.append(server_info)
+        if server_instructions:
+            instructions_parts.append(
+                f"## {server_info['name']} Server\n{server_instructions}"
             )
 
     combined_instructions = (
@@ -84,10 +123,33 @@ async def initialize_mcp_client(
 
     # Mount external servers
     for server_info in external_servers:
-        client_for_mount = Client(server_info["config"])
-        proxy = FastMCP.as_proxy(client_for_mount, name=server_info["name"])
+        proxy = FastMCP.as_proxy(server_info["client"], name=server_info["name"])
         composed_mcp.mount(proxy, prefix=server_info["prefix"])
 
+    # Only add the native servers header if there are enabled native servers
+    if enabled_native_servers:
+        initial_string = "## Native MCP Servers\nThese servers are provided by default by TinkerTasker.\n\n"
+        combined_instructions = initial_string + combined_instructions
+
+    return composed_mcp, combined_instructions
+
+
+async def initialize_mcp_client(
+    workspace_path: Path, config: AgentConfig, session_pool: MCPSessionPool
+) -> tuple[Client, str]:
+    """Compose the enabled native and external MCP servers behind a single Client.
+
+    External servers are connected through the session pool, which must stay open while the Client is used.
+    The composed server is kept in the session pool and reused for configs with the same servers,
+    only the Client with the workspace roots is created for each call.
+    """
+    key = _composition_key(config)
+    if key not in session_pool.composed_servers:
+        session_pool.composed_servers[key] = await _compose_mcp_servers(
+            config, session_pool
+        )
+    composed_mcp, combined_instructions = session_pool.composed_servers[key]
+
     client = Client(
         composed_mcp,
         roots=[
@@ -97,37 +159,37 @@ async def initialize_mcp_client(
             )
         ],
     )
-
-    # Only add the native servers header if there are enabled native servers
-    if enabled_native_servers:
-        initial_string = "## Native MCP Servers\nThese servers are provided by default by TinkerTasker.\n\n"
-        combined_instructions = initial_string + combined_instructions
-
     return client, combined_instructions
 
 
 async def _main(workspace_path: Path):
     """Example usage"""
     config = AgentConfig()
-    client, mcp_instructions = await initialize_mcp_client(workspace_path, config)
-    async with client:
-        agent = Agent(
-            mcp_client=client,
-            config=config,
-            working_directory=workspace_path,
-            mcp_instructions=mcp_instructions,
+    async with MCPSessionPool() as session_pool:
+        client, mcp_instructions = await initialize_mcp_client(
+            workspace_path, config, session_pool
         )
-        async for event in agent.turn(
-            "Can you look what files are in my working directory summarize the first two you see? Then use context7 to search for the numpy documentation",
-        ):
-            if isinstance(event, AssistantMessageData):
-                if event.message:
-                    print(f"Assistant: {event.message}")
-                if event.tool_calls:
-                    for tool_call in event.tool_calls:
-                        print(f"Tool call: {tool_call.name}({tool_call.args})")
-            elif isinstance(event, ToolMessageData):
-                print(f"Tool result ({event.name}): {event.content}")
+        async with client:
+            agent = Agent(
+                mcp_client=client,
+                config=config,
+                working_directory=workspace_path,
+                mcp_instructions=mcp_instructions,
+            )
+            async for event in agent.turn(
+                "Can you look what files are in my working directory summarize the first two you see? Then use context7 to search for the numpy documentation",
+            ):
+                if isinstance(event, AssistantMessageChunk):
+                    print(event.content, end="", flush=True)
+                elif isinstance(event, AssistantMessageData):
+                    # The message itself was already printed as it streamed
+                    if event.message:
+                        print()
+                    if event.tool_calls:
+                        for tool_call in event.tool_calls:
+                            print(f"Tool call: {tool_call.name}({tool_call.args})")
+                elif isinstance(event, ToolMessageData):
+                    print(f"Tool result ({event.name}): {event.content}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+from contextlib import AsyncExitStack
+from typing import Any
+
+from fastmcp import Client, FastMCP
+
+
+class MCPSessionPool:
+    """Keeps one connected Client per external MCP server.
+
+    The same Client is used to fetch the server info and as the backend of its proxy.
+    Because it stays connected, every proxied tool call reuses its session
+    instead of initializing and tearing down a new one.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, Client] = {}
+        self._exit_stack = AsyncExitStack()
+        # Servers composed on top of the pooled Clients and their instructions, see initialize_mcp_client
+        self.composed_servers: dict[tuple, tuple[FastMCP, str]] = {}
+
+    async def acquire(self, key: str, mcp_config: dict[str, Any]) -> Client:
+        """Get the connected Client for the server, connecting it on first use."""
+        if key not in self._clients:
+            client = Client(mcp_config)
+            await self._exit_stack.enter_async_context(client)
+            # Leaving the context keeps stdio servers alive, closing also stops their process
+            self._exit_stack.push_async_callback(client.close)
+            self._clients[key] = client
+        return self._clients[key]
+
+    async def close_all(self) -> None:
+        """Disconnect all the pooled Clients."""
+        self._clients.clear()
+        self.composed_servers.clear()
+        await self._exit_stack.aclose()
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close_all()
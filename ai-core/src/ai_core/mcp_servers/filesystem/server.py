@@ -2,19 +2,33 @@
 See https://docs.anthropic.com/en/docs/agents-and-tools/tool-use/text-editor-tool for more details on text editing tools.
 """
 
+import asyncio
+from contextlib import suppress
+from itertools import chain, islice
+import os
 from pathlib import Path
+import time
+from weakref import WeakKeyDictionary
 
 from fastmcp import Context, FastMCP
+from mcp.server.session import ServerSession
 
 from ai_core.mcp_servers.filesystem.convert_bin_files import bytes_to_str
 
+# How long the root directory of a session is reused before asking the client for its roots again
+ROOT_DIR_CACHE_SECONDS = 30
 
-async def get_working_dir(ctx: Context, cwd_fallback: bool = False) -> Path | str:
-    """Get the working directory as the first root directory configured in the MCP client.
+# The characters str.splitlines ends a line on, so that the edit tools number lines the same as view
+LINE_BREAKS = tuple("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
 
-    Returns:
-        Either the working directory Path or an error string
-    """
+# The root directory of each client session and when it expires, see get_working_dir
+_root_dirs: WeakKeyDictionary[ServerSession, tuple[Path | None, float]] = (
+    WeakKeyDictionary()
+)
+
+
+async def get_root_dir(ctx: Context) -> Path | None:
+    """Get the first root directory configured in the MCP client, if there is one."""
     roots = await ctx.list_roots()
 
     if roots and roots[0].uri and roots[0].uri.path:
@@ -25,6 +39,26 @@ async def get_working_dir(ctx: Context, cwd_fallback: bool = False) -> Path | st
             # Convert /C:/path to C:/path for Windows
             uri_path = uri_path[1:]
         return Path(uri_path).resolve()
+    return None
+
+
+async def get_working_dir(ctx: Context, cwd_fallback: bool = False) -> Path | str:
+    """Get the working directory as the first root directory configured in the MCP client.
+    The root directory is cached per client session for ROOT_DIR_CACHE_SECONDS,
+    so consecutive tool calls do not each request the roots from the client.
+
+    Returns:
+        Either the working directory Path or an error string
+    """
+    cached = _root_dirs.get(ctx.session)
+    if cached is not None and cached[1] > time.monotonic():
+        root_dir = cached[0]
+    else:
+        root_dir = await get_root_dir(ctx)
+        _root_dirs[ctx.session] = (root_dir, time.monotonic() + ROOT_DIR_CACHE_SECONDS)
+
+    if root_dir is not None:
+        return root_dir
     elif cwd_fallback:
         return Path.cwd()
 
@@ -66,6 +100,30 @@ async def resolve_path(
     return resolved_path
 
 
+def _list_directory(
+    dir_path: str, depth: int, max_depth: int, lines: list[str]
+) -> None:
+    """Append the entries of a directory to lines, sorted by name and recursing into subdirectories up to max_depth.
+
+    os.scandir provides the entry types from the directory listing itself,
+    so only symlinks need a stat call to show whether they point to a directory.
+    """
+    with os.scandir(dir_path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    indent = "  " * depth
+    for entry in entries:
+        name = entry.name + ("/" if entry.is_dir() else "")
+        lines.append(f"{indent}- {name}")
+        # Symlinked directories are listed but not followed
+        if entry.is_dir(follow_symlinks=False) and (
+            max_depth <= 0 or depth < max_depth
+        ):
+            # Unreadable subdirectories are listed without their contents
+            with suppress(PermissionError):
+                _list_directory(entry.path, depth + 1, max_depth, lines)
+
+
 def format_directory_tree(path: Path, max_depth: int = 1) -> str:
     """Format a directory as a tree structure with configurable depth.
 
@@ -74,30 +132,12 @@ def format_directory_tree(path: Path, max_depth: int = 1) -> str:
         max_depth: Maximum depth to traverse (1 = immediate children only, -1 = unlimited)
     """
     lines = [f"- {path}/"]
-    path_count = 0
     try:
-        if max_depth == 1:
-            # Use iterdir() for immediate children only
-            for item in sorted(path.iterdir()):
-                name = item.name + ("/" if item.is_dir() else "")
-                lines.append(f"  - {name}")
-                path_count += 1
-        else:
-            # Use rglob() for recursive traversal
-            for item in sorted(path.rglob("*")):
-                relative = item.relative_to(path)
-                depth = len(relative.parts)
-
-                # Skip items beyond max_depth if specified
-                if max_depth > 0 and depth > max_depth:
-                    continue
-
-                indent = "  " * depth
-                name = item.name + ("/" if item.is_dir() else "")
-                lines.append(f"{indent}- {name}")
-                path_count += 1
+        _list_directory(str(path), 1, max_depth, lines)
+        path_count = len(lines) - 1
     except PermissionError:
         lines.append("  (Permission denied)")
+        path_count = 0
 
     if path_count == 0:
         return "The directory is empty"
@@ -105,6 +145,14 @@ def format_directory_tree(path: Path, max_depth: int = 1) -> str:
     return result
 
 
+def looks_binary(path: Path) -> bool:
+    """Check the start of a file for a NUL byte, which text files do not contain.
+    Invalid UTF-8 without NUL bytes is still caught when the file is decoded.
+    """
+    with path.open("rb") as f:
+        return b"\x00" in f.read(8192)
+
+
 async def validate_file_for_editing(ctx: Context, path: str) -> tuple[Path, str] | str:
     """Validate a file path for editing operations.
 
@@ -121,7 +169,10 @@ async def validate_file_for_editing(ctx: Context, path: str) -> tuple[Path, str]
             return f"Error: File not found at {resolved_path}"
         if resolved_path.is_dir():
             return f"Error: Cannot edit directory: {resolved_path}"
-        content = resolved_path.read_text(encoding="utf-8")
+        # Reject binaries before reading the whole file
+        if await asyncio.to_thread(looks_binary, resolved_path):
+            return f"Error: Cannot edit binary files. The file appears to be a binary {resolved_path.suffix} file"
+        content = await asyncio.to_thread(resolved_path.read_text, encoding="utf-8")
         return resolved_path, content
 
     except UnicodeDecodeError:
@@ -138,6 +189,17 @@ mcp = FastMCP(
 )
 
 
+def number_lines(lines: list[str], line_offset: int) -> list[str]:
+    """Prefix each line with its line number, where the first line is number line_offset + 1.
+    The numbers are right aligned to the width of the largest one.
+    """
+    line_format = f"%{len(str(line_offset + len(lines)))}d→%s"
+    return [
+        line_format % (line_num, line)
+        for line_num, line in enumerate(lines, start=line_offset + 1)
+    ]
+
+
 def format_file_content_with_lines(
     content: str, start_line: int = 1, end_line: int = -1
 ) -> str:
@@ -160,23 +222,49 @@ def format_file_content_with_lines(
     start_idx = max(0, start_line - 1)
     end_idx = len(lines) if end_line == -1 else min(len(lines), end_line)
     selected_lines = lines[start_idx:end_idx]
-    line_offset = start_idx
-
-    # Keeps the line numbers aligned
-    max_line_num = line_offset + len(selected_lines)
-    width = len(str(max_line_num))
-
-    numbered_lines = []
-    for i, line in enumerate(selected_lines):
-        line_num = line_offset + i + 1
-        numbered_lines.append(f"{line_num:>{width}}→{line}")
+    numbered_lines = number_lines(selected_lines, line_offset=start_idx)
 
     lines_read = len(selected_lines)
     result = f"Read {lines_read} lines\n" + "\n".join(numbered_lines)
     return result
 
 
-@mcp.tool
+def format_file_range_with_lines(path: Path, start_line: int, end_line: int) -> str:
+    """Like format_file_content_with_lines, but only reads the file up to end_line instead of all of it.
+
+    Args:
+        path: The path of the text file
+        start_line: The starting line number to view (1-indexed, inclusive)
+        end_line: The ending line number to view (1-indexed, inclusive), which must be positive
+
+    Raises:
+        UnicodeDecodeError: If the part of the file that was read is not valid UTF-8
+    """
+    start_idx = max(0, start_line - 1)
+    with path.open(encoding="utf-8") as f:
+        # Iterating the file splits only on newlines, so each line is split again to number lines like str.splitlines
+        lines = chain.from_iterable(line.splitlines() for line in f)
+        selected_lines = list(islice(lines, start_idx, end_line))
+
+    if not selected_lines and path.stat().st_size == 0:
+        return "The file is empty"
+
+    numbered_lines = number_lines(selected_lines, line_offset=start_idx)
+    result = f"Read {len(selected_lines)} lines\n" + "\n".join(numbered_lines)
+    return result
+
+
+async def view_binary_file(path: Path, start_line: int, end_line: int) -> str:
+    """Convert a binary file (pdf, docx, images, ...) to text and format it with line numbers."""
+    try:
+        file_bytes = await asyncio.to_thread(path.read_bytes)
+        content = await bytes_to_str(file_bytes=file_bytes, filename=str(path))
+        return format_file_content_with_lines(content, start_line, end_line)
+    except Exception as e:
+        return f"Error converting binary file {path}: {e!s}"
+
+
+@mcp.tool(annotations={"readOnlyHint": True})
 async def view(
     ctx: Context,
     path: str,
@@ -202,20 +290,25 @@ async def view(
         if not resolved_path.exists():
             return f"Error: Path not found: {path}"
         if resolved_path.is_dir():
-            return format_directory_tree(resolved_path, max_depth=1)
+            return await asyncio.to_thread(
+                format_directory_tree, resolved_path, max_depth=1
+            )
+
+        # Binaries go straight to conversion instead of failing a UTF-8 read first
+        if await asyncio.to_thread(looks_binary, resolved_path):
+            return await view_binary_file(resolved_path, start_line, end_line)
 
-        content = resolved_path.read_text(encoding="utf-8")
+        # A bounded range only needs the start of the file
+        if end_line > 0:
+            return await asyncio.to_thread(
+                format_file_range_with_lines, resolved_path, start_line, end_line
+            )
+
+        content = await asyncio.to_thread(resolved_path.read_text, encoding="utf-8")
         return format_file_content_with_lines(content, start_line, end_line)
 
     except UnicodeDecodeError:
-        try:
-            file_bytes = resolved_path.read_bytes()
-            content = await bytes_to_str(
-                file_bytes=file_bytes, filename=str(resolved_path)
-            )
-            return format_file_content_with_lines(content, start_line, end_line)
-        except Exception as e:
-            return f"Error converting binary file {resolved_path}: {e!s}"
+        return await view_binary_file(resolved_path, start_line, end_line)
     except PermissionError:
         return f"Error: Permission denied: {resolved_path}"
     except Exception as e:
@@ -237,44 +330,48 @@ async def insert(ctx: Context, path: str, insert_line: int, new_str: str) -> str
     resolved_path, content = validation_result
 
     try:
-        lines = content.splitlines()
-
         # Validate insert_line parameter
         if insert_line < 0:
             return f"Error: insert_line must be >= 0, got {insert_line}"
 
         # If insert_line is beyond the end of the file, append to the end
-        if insert_line > len(lines):
-            insert_line = len(lines)
-
-        lines.insert(insert_line, new_str)
-        new_content = "\n".join(lines)
-        resolved_path.write_text(new_content, encoding="utf-8")
+        content_lines = content.splitlines(keepends=True)
+        insert_line = min(insert_line, len(content_lines))
+
+        # Splice the text into the content instead of joining the lines again, so the line endings are kept
+        offset = sum(len(line) for line in content_lines[:insert_line])
+        if offset == len(content) and not content.endswith(LINE_BREAKS):
+            # The last line has no newline, so the inserted text becomes the last line without one
+            new_content = content + ("\n" if content else "") + new_str
+        else:
+            new_content = content[:offset] + new_str + "\n" + content[offset:]
+        await asyncio.to_thread(resolved_path.write_text, new_content, encoding="utf-8")
+        lines = new_content.splitlines()
 
         # Show context around the inserted line
         context_lines = 2
         start_idx = max(0, insert_line - context_lines)
         end_idx = min(len(lines), insert_line + context_lines + 1)
         selected_lines = lines[start_idx:end_idx]
-        line_offset = start_idx
-
-        # Keeps the line numbers aligned (like view function)
-        max_line_num = line_offset + len(selected_lines)
-        width = len(str(max_line_num))
 
         # Build the output showing line numbers and content (like Edit tool)
         output_lines = [
-            f"Successfully inserted text at line {insert_line} in {resolved_path}"
+            f"Successfully inserted text at line {insert_line} in {resolved_path}",
+            *number_lines(selected_lines, line_offset=start_idx),
         ]
-        for i, line in enumerate(selected_lines):
-            line_num = line_offset + i + 1
-            output_lines.append(f"{line_num:>{width}}→{line}")
-
         return "\n".join(output_lines)
     except Exception as e:
         return f"Error inserting into {resolved_path}: {e!s}"
 
 
+def common_prefix_length(a: str, b: str) -> int:
+    """Get the length of the prefix that both strings start with."""
+    for i, (char_a, char_b) in enumerate(zip(a, b, strict=False)):
+        if char_a != char_b:
+            return i
+    return min(len(a), len(b))
+
+
 @mcp.tool
 async def str_replace(
     ctx: Context, path: str, old_str: str, new_str: str, replace_all: bool = False
@@ -295,11 +392,12 @@ async def str_replace(
     resolved_path, content = validation_result
 
     try:
-        if old_str not in content:
+        first_pos = content.find(old_str)
+        if first_pos == -1:
             return f"Error: String not found in {path}: '{old_str}'"
 
-        # Check for multiple occurrences when replace_all is False
         occurrence_count = content.count(old_str)
+        # Check for multiple occurrences when replace_all is False
         if not replace_all and occurrence_count > 1:
             return f"Error: replace_all is False, but {occurrence_count} occurrences were found. Set replace_all to True if you want to replace all occurrences, or make old_str more specific to replace only one instance."
 
@@ -310,32 +408,24 @@ async def str_replace(
             new_content = content.replace(old_str, new_str, 1)
             replacement_count = 1
 
-        resolved_path.write_text(new_content, encoding="utf-8")
+        await asyncio.to_thread(resolved_path.write_text, new_content, encoding="utf-8")
 
         # Show context around the replacement (like insert function)
         lines = new_content.splitlines()
 
-        # Find the first line that changed by comparing with original content
-        original_lines = content.splitlines()
-        changed_line_idx = 0  # Default to first line if we can't find the change
-
-        for i, (old_line, new_line) in enumerate(
-            zip(original_lines, lines, strict=True)
-        ):
-            if old_line != new_line:
-                changed_line_idx = i
-                break
+        # The first changed line is where the first occurrence stops matching new_str
+        changed_pos = first_pos + common_prefix_length(old_str, new_str)
+        lines_before = content[:changed_pos].splitlines(keepends=True)
+        changed_line_idx = len(lines_before)
+        if lines_before and not lines_before[-1].endswith(LINE_BREAKS):
+            # The change starts partway through the last of these lines
+            changed_line_idx -= 1
 
         # Show context around the changed line
         context_lines = 2
         start_idx = max(0, changed_line_idx - context_lines)
         end_idx = min(len(lines), changed_line_idx + context_lines + 1)
         selected_lines = lines[start_idx:end_idx]
-        line_offset = start_idx
-
-        # Keeps the line numbers aligned (like view function)
-        max_line_num = line_offset + len(selected_lines)
-        width = len(str(max_line_num))
 
         # Build the output showing line numbers and content
         if replace_all:
@@ -344,16 +434,31 @@ async def str_replace(
             ]
         else:
             output_lines = [f"Successfully replaced text in {resolved_path}:"]
-
-        for i, line in enumerate(selected_lines):
-            line_num = line_offset + i + 1
-            output_lines.append(f"{line_num:>{width}}→{line}")
+        output_lines.extend(number_lines(selected_lines, line_offset=start_idx))
 
         return "\n".join(output_lines)
     except Exception as e:
         return f"Error replacing in {path}: {e!s}"
 
 
+def create_file(path: Path, text: str) -> None:
+    """Create a new file with the text, creating its parent directories if they are missing.
+
+    The file is opened in exclusive creation mode, so checking that nothing exists at the path
+    and creating the file is a single atomic operation.
+
+    Raises:
+        FileExistsError: If a file or directory already exists at the path
+    """
+    try:
+        f = path.open("x", encoding="utf-8")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = path.open("x", encoding="utf-8")
+    with f:
+        f.write(text)
+
+
 @mcp.tool
 async def create(ctx: Context, path: str, file_text: str) -> str:
     """Creates a new file with the specified text.
@@ -367,14 +472,12 @@ async def create(ctx: Context, path: str, file_text: str) -> str:
         return resolved_path
 
     try:
+        await asyncio.to_thread(create_file, resolved_path, file_text)
+        return f"File successfully created at {resolved_path}"
+    except FileExistsError:
         if resolved_path.is_dir():
             return f"Error: Cannot create file at directory: {resolved_path}"
-        if resolved_path.exists():
-            return f"Error: File already exists at {resolved_path} use str_replace or insert to modify it."
-
-        resolved_path.parent.mkdir(parents=True, exist_ok=True)
-        resolved_path.write_text(file_text, encoding="utf-8")
-        return f"File successfully created at {resolved_path}"
+        return f"Error: File already exists at {resolved_path} use str_replace or insert to modify it."
     except PermissionError:
         return f"Error: Permission denied: {resolved_path}"
     except Exception as e:
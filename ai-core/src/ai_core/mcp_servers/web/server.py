@@ -1,3 +1,4 @@
+import asyncio
 from functools import lru_cache
 import warnings
 
@@ -46,7 +47,19 @@ def _truncate_str(text: str, max_len: int) -> str:
         return text
 
 
-@mcp.tool
+def _filter_links(urls: list[str], max_tokens: int, max_links: int) -> list[str]:
+    """Keeps the first max_links URLs with at most max_tokens tokens."""
+    filtered_urls = []
+    for url in urls:
+        # Every token covers at least one UTF-8 byte, so only longer URLs need to be tokenized
+        if len(url.encode()) <= max_tokens or _count_tokens(url) <= max_tokens:
+            filtered_urls.append(url)
+            if len(filtered_urls) == max_links:
+                break
+    return filtered_urls
+
+
+@mcp.tool(annotations={"readOnlyHint": True})
 async def fetch(url: str) -> str:
     """Fetches web content as Markdown for the given URL. Use this tool when you need to retrieve and analyze web content.
     Returns a list of the links found on the page so you can use this tool as the beginning of a web exploration task.
@@ -59,7 +72,8 @@ async def fetch(url: str) -> str:
         url (str): The URL to fetch which must be a fully-formed valid URL.
     """
     url_result = await process_url(url)
-    markdown = _truncate_str(url_result.markdown, max_len=8000)
+    # Tokenizing a large page blocks, so it runs in a thread to keep serving other requests
+    markdown = await asyncio.to_thread(_truncate_str, url_result.markdown, max_len=8000)
 
     # Compute size of original markdown content
     size = len(url_result.markdown.encode("utf-8"))
@@ -68,12 +82,12 @@ async def fetch(url: str) -> str:
     links_section = ""
     if url_result.links:
         # Filter links that have more than 100 tokens and take first 100
-        filtered_links = [
-            link for link in url_result.links if _count_tokens(link.url) <= 100
-        ][:100]
+        filtered_urls = _filter_links(
+            [link.url for link in url_result.links], max_tokens=100, max_links=100
+        )
 
-        if filtered_links:
-            links_xml = "\n".join(f"<link>{link.url}</link>" for link in filtered_links)
+        if filtered_urls:
+            links_xml = "\n".join(f"<link>{url}</link>" for url in filtered_urls)
             links_section = f"<links>\n{links_xml}\n</links>"
 
     formatted_output = f"""Received content ({size / 1024:.1f}KB)
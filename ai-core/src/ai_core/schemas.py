@@ -1,22 +1,58 @@
 import json
 import uuid
 
-from openai.types.chat import ChatCompletionMessageParam, ChatCompletionToolMessageParam
-from pydantic import BaseModel, Field, SkipValidation
+from openai.types.chat import (
+    ChatCompletionMessageParam,
+    ChatCompletionMessageToolCallParam,
+    ChatCompletionToolMessageParam,
+)
+from pydantic import BaseModel, Field, PrivateAttr, SkipValidation
 from pydantic_extra_types.pendulum_dt import DateTime
 
 
 class Message(BaseModel):
-    message_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: DateTime = DateTime.now()
+    message_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    timestamp: DateTime = Field(default_factory=DateTime.now)
     chat_completion_message_param: SkipValidation[ChatCompletionMessageParam]
 
 
 class MessageHistory(BaseModel):
+    """The messages of a conversation, where the first message is the system prompt.
+
+    If window_size is set, older messages are dropped from what is sent to the LLM using an expanding window:
+    the window grows to twice window_size and then restarts from the last window_size messages.
+    Between restarts every request extends the previous one, so provider prompt caches keep hitting.
+    A restart that would begin on tool results begins at the assistant message that called the tools instead.
+
+    Messages are only ever appended, so each one is converted to a dict once and reused for later requests.
+    """
+
     messages: list[Message] = []
+    window_size: int | None = None
+    window_start: int = 1
+    _message_dicts: list[dict] = PrivateAttr(default_factory=list)
 
     def get_messages(self) -> list[dict]:
-        messages = [dict(msg.chat_completion_message_param) for msg in self.messages]
+        if (
+            self.window_size is not None
+            and len(self.messages) - self.window_start > 2 * self.window_size
+        ):
+            self.window_start = len(self.messages) - self.window_size
+            # A tool result cannot be sent without the assistant message that called the tool
+            while (
+                self.window_start > 1
+                and self.messages[self.window_start].chat_completion_message_param[
+                    "role"
+                ]
+                == "tool"
+            ):
+                self.window_start -= 1
+
+        self._message_dicts.extend(
+            dict(msg.chat_completion_message_param)
+            for msg in self.messages[len(self._message_dicts) :]
+        )
+        messages = self._message_dicts[:1] + self._message_dicts[self.window_start :]
         return messages
 
 
@@ -31,18 +67,24 @@ class AssistantMessageData(BaseModel):
     tool_calls: list[ToolCallData] = []
 
 
+class AssistantMessageChunk(BaseModel):
+    """Partial assistant content, yielded while the response is still streaming."""
+
+    content: str
+
+
 class ToolMessageData(BaseModel):
     name: str
     id: str
     content: str
 
 
-MessageData = AssistantMessageData | ToolMessageData
+MessageData = AssistantMessageData | AssistantMessageChunk | ToolMessageData
 
 
 def create_message_data(
     assistant_response: dict | None = None,
-    tool_call: dict | None = None,
+    tool_call: ChatCompletionMessageToolCallParam | None = None,
     tool_message: ChatCompletionToolMessageParam | None = None,
 ) -> MessageData:
     """
@@ -7,7 +7,12 @@ import mcp.types as mcp_types
 from mcp.types import TextContent
 from pydantic import FileUrl
 
-from ai_core.mcp_servers.filesystem.server import mcp
+from ai_core.mcp_servers.filesystem import server as filesystem_server
+from ai_core.mcp_servers.filesystem.server import format_directory_tree, mcp
+
+SAMPLE_FILES_DIR = Path(__file__).parent / "sample_files"
+SAMPLE_PDF_BYTES = (SAMPLE_FILES_DIR / "Sample Doc.pdf").read_bytes()
+SAMPLE_DOCX_BYTES = (SAMPLE_FILES_DIR / "Sample Doc.docx").read_bytes()
 
 
 @asynccontextmanager
@@ -25,6 +30,35 @@ async def filesystem_test_setup():
             yield tmpdir, client
 
 
+# region working directory
+
+
+async def test_roots_cached_per_session(monkeypatch):
+    """Test that the roots are requested once per session until the cache expires."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "test.txt").write_text("Hello, World!")
+        roots_requests = 0
+
+        def list_roots(context) -> list[mcp_types.Root]:
+            nonlocal roots_requests
+            roots_requests += 1
+            return [mcp_types.Root(uri=FileUrl(f"file://{tmpdir}"))]
+
+        async with Client(mcp, roots=list_roots) as client:
+            # An expired cache entry is refreshed on the next call
+            monkeypatch.setattr(filesystem_server, "ROOT_DIR_CACHE_SECONDS", 0)
+            await client.call_tool("view", {"path": "test.txt"})
+            await client.call_tool("view", {"path": "test.txt"})
+            assert roots_requests == 2
+
+            monkeypatch.setattr(filesystem_server, "ROOT_DIR_CACHE_SECONDS", 30)
+            await client.call_tool("view", {"path": "test.txt"})
+            await client.call_tool("view", {"path": "test.txt"})
+            assert roots_requests == 3
+
+
+# endregion
+
 # region view
 
 
@@ -114,6 +148,46 @@ async def test_view_zero_range():
         )
 
 
+async def test_view_range_empty_file():
+    """Test viewing a range of an empty file reports that it is empty."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "empty.txt"
+        test_file.write_text("")
+        await call_view_and_check(
+            client, str(test_file), "The file is empty", start_line=1, end_line=10
+        )
+
+
+async def test_view_range_past_end():
+    """Test viewing a range past the end of a file reads no lines."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "multiline.txt"
+        test_file.write_text("Line 1\r\nLine 2\r\n")
+        await call_view_and_check(
+            client, str(test_file), "Read 1 lines\n2→Line 2", start_line=2, end_line=5
+        )
+        await call_view_and_check(
+            client, str(test_file), "Read 0 lines\n", start_line=3, end_line=5
+        )
+
+
+async def test_view_range_numbers_lines_like_full_view():
+    """Test that viewing a range numbers the lines like viewing the whole file, which also ends lines on form feeds."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "multiline.txt"
+        test_file.write_text("one\x0ctwo\nthree\nfour\n")
+        await call_view_and_check(
+            client, str(test_file), "Read 4 lines\n1→one\n2→two\n3→three\n4→four"
+        )
+        await call_view_and_check(
+            client,
+            str(test_file),
+            "Read 2 lines\n2→two\n3→three",
+            start_line=2,
+            end_line=3,
+        )
+
+
 async def test_view_binary_file():
     """Test viewing a binary file shows an error message."""
     async with filesystem_test_setup() as (tmpdir, client):
@@ -148,6 +222,22 @@ async def test_view_directory():
         await call_view_and_check(client, str(base_dir), expected_text)
 
 
+def test_format_directory_tree_max_depth(tmp_path: Path):
+    """Test that nested directories are listed up to max_depth, with children under their parent."""
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "file.txt").write_text("content")
+    (tmp_path / "z.txt").write_text("content")
+
+    expected_text = f"""Listed 4 paths
+- {tmp_path}/
+  - a/
+    - b/
+    - file.txt
+  - z.txt"""
+
+    assert format_directory_tree(tmp_path, max_depth=2) == expected_text
+
+
 async def test_view_directory_empty():
     """Test viewing an empty directory shows just the directory name."""
     async with filesystem_test_setup() as (tmpdir, client):
@@ -160,10 +250,8 @@ async def test_view_directory_empty():
 async def test_view_pdf_file():
     """Test viewing a PDF file converts it to readable text."""
     async with filesystem_test_setup() as (tmpdir, client):
-        sample_files_dir = Path(__file__).parent / "sample_files"
-        sample_pdf = sample_files_dir / "Sample Doc.pdf"
         test_pdf = Path(tmpdir) / "test.pdf"
-        test_pdf.write_bytes(sample_pdf.read_bytes())
+        test_pdf.write_bytes(SAMPLE_PDF_BYTES)
 
         expected_text = """Read 4 lines
 1→Hello!
@@ -177,10 +265,8 @@ async def test_view_pdf_file():
 async def test_view_docx_file():
     """Test viewing a DOCX file converts it to readable text."""
     async with filesystem_test_setup() as (tmpdir, client):
-        sample_files_dir = Path(__file__).parent / "sample_files"
-        sample_docx = sample_files_dir / "Sample Doc.docx"
         test_docx = Path(tmpdir) / "test.docx"
-        test_docx.write_bytes(sample_docx.read_bytes())
+        test_docx.write_bytes(SAMPLE_DOCX_BYTES)
 
         expected_text = """Read 7 lines
 1→Hello!
@@ -197,10 +283,8 @@ async def test_view_docx_file():
 async def test_view_pdf_file_with_line_range():
     """Test viewing a PDF file with specific line range."""
     async with filesystem_test_setup() as (tmpdir, client):
-        sample_files_dir = Path(__file__).parent / "sample_files"
-        sample_pdf = sample_files_dir / "Sample Doc.pdf"
         test_pdf = Path(tmpdir) / "test.pdf"
-        test_pdf.write_bytes(sample_pdf.read_bytes())
+        test_pdf.write_bytes(SAMPLE_PDF_BYTES)
 
         expected_text = """Read 2 lines
 2→This is some sample Word document content
@@ -214,10 +298,8 @@ async def test_view_pdf_file_with_line_range():
 async def test_view_docx_file_with_line_range():
     """Test viewing a DOCX file with specific line range."""
     async with filesystem_test_setup() as (tmpdir, client):
-        sample_files_dir = Path(__file__).parent / "sample_files"
-        sample_docx = sample_files_dir / "Sample Doc.docx"
         test_docx = Path(tmpdir) / "test.docx"
-        test_docx.write_bytes(sample_docx.read_bytes())
+        test_docx.write_bytes(SAMPLE_DOCX_BYTES)
 
         expected_text = """Read 2 lines
 2→
@@ -307,6 +389,48 @@ async def test_insert_past_end():
         assert updated_content == expected_content
 
 
+async def test_insert_keeps_trailing_newline():
+    """Test that inserting into files with and without content keeps their last newline as it was."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "test.txt"
+        test_file.write_text("Line 1\nLine 2\n")
+        empty_file = Path(tmpdir) / "empty.txt"
+        empty_file.write_text("")
+
+        await client.call_tool(
+            "insert", {"path": "test.txt", "insert_line": 1, "new_str": "Middle"}
+        )
+        await client.call_tool(
+            "insert", {"path": "test.txt", "insert_line": 3, "new_str": "Last"}
+        )
+        await client.call_tool(
+            "insert", {"path": "empty.txt", "insert_line": 0, "new_str": "Only"}
+        )
+
+        assert test_file.read_text() == "Line 1\nMiddle\nLine 2\nLast\n"
+        assert empty_file.read_text() == "Only"
+
+
+async def test_insert_numbers_lines_like_view():
+    """Test that insert counts lines like view, which also ends lines on form feeds."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "test.txt"
+        test_file.write_text("one\x0ctwo\nthree\nfour\n")
+
+        result = await client.call_tool(
+            "insert", {"path": "test.txt", "insert_line": 2, "new_str": "NEW"}
+        )
+
+        expected_output = f"""Successfully inserted text at line 2 in {test_file}
+1→one
+2→two
+3→NEW
+4→three
+5→four"""
+        assert result == [TextContent(type="text", text=expected_output)]
+        assert test_file.read_text() == "one\x0ctwo\nNEW\nthree\nfour\n"
+
+
 async def test_insert_nonexistent_file():
     """Test inserting into a file that does not exist."""
     async with filesystem_test_setup() as (tmpdir, client):
@@ -378,6 +502,25 @@ async def test_str_replace():
         assert updated_content == expected_content
 
 
+async def test_str_replace_numbers_lines_like_view():
+    """Test that the context after a replacement counts lines like view, which also ends lines on form feeds."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        test_file = Path(tmpdir) / "test.txt"
+        test_file.write_text("one\x0ctwo\nthree\nfour\nfive\nsix\n")
+
+        result = await client.call_tool(
+            "str_replace", {"path": "test.txt", "old_str": "four", "new_str": "FOUR"}
+        )
+
+        expected_output = f"""Successfully replaced text in {test_file}:
+2→two
+3→three
+4→FOUR
+5→five
+6→six"""
+        assert result == [TextContent(type="text", text=expected_output)]
+
+
 async def test_str_replace_old_not_found():
     """Test replacing a string that does not exist in the file."""
     async with filesystem_test_setup() as (tmpdir, client):
@@ -473,6 +616,29 @@ async def test_str_replace_nonexistent_file():
         assert not nonexistent_file.exists()
 
 
+async def test_str_replace_binary_file():
+    """Test that files with NUL bytes are rejected even when they decode as UTF-8."""
+    async with filesystem_test_setup() as (tmpdir, client):
+        binary_file = Path(tmpdir) / "data.bin"
+        binary_file.write_bytes(b"Hello\x00World")
+
+        result = await client.call_tool(
+            "str_replace",
+            {
+                "path": "data.bin",
+                "old_str": "Hello",
+                "new_str": "Hi",
+                "replace_all": False,
+            },
+        )
+
+        expected_output = (
+            "Error: Cannot edit binary files. The file appears to be a binary .bin file"
+        )
+        assert result == [TextContent(type="text", text=expected_output)]
+        assert binary_file.read_bytes() == b"Hello\x00World"
+
+
 # endregion
 
 # region create
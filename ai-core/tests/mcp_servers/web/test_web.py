@@ -1,9 +1,29 @@
 from fastmcp import Client
+import pytest
 
-from ai_core.mcp_servers.web.server import mcp
+from ai_core.mcp_servers.web.server import _count_tokens, _filter_links, mcp
 
 
+@pytest.mark.network
 async def test_fetch():
     async with Client(mcp) as client:
         result = await client.call_tool("fetch", {"url": "https://example.com/"})
         print(result)
+
+
+def test_filter_links():
+    """Test that links with too many tokens are dropped and only the first links are kept."""
+    long_url = "https://example.com/" + "/".join(str(i) for i in range(200))
+    urls = [f"https://example.com/{i}" for i in range(3)]
+
+    assert _filter_links([long_url, *urls], max_tokens=100, max_links=2) == urls[:2]
+
+    # Rare non-ASCII characters take several tokens each, so a URL of 100 characters can still be too long
+    non_ascii_url = "https://example.com/" + "".join(
+        chr(0x20000 + i * 97) for i in range(80)
+    )
+    assert len(non_ascii_url) == 100
+    assert _count_tokens(non_ascii_url) > 100
+    assert (
+        _filter_links([non_ascii_url, *urls], max_tokens=100, max_links=2) == urls[:2]
+    )
@@ -0,0 +1,287 @@
+import asyncio
+from pathlib import Path
+
+from litellm.types.utils import (
+    ChatCompletionDeltaToolCall,
+    Delta,
+    Function,
+    ModelResponseStream,
+    StreamingChoices,
+)
+from mcp.types import TextContent, Tool, ToolAnnotations
+import pytest
+
+from ai_core import agent as agent_module
+from ai_core.agent import Agent
+from ai_core.config import AgentConfig
+from ai_core.schemas import AssistantMessageChunk, AssistantMessageData, ToolMessageData
+
+
+class StubMCPClient:
+    """Stands in for the fastmcp Client, recording when each tool call starts and finishes."""
+
+    def __init__(self, read_only_tools: set[str] | None = None) -> None:
+        self.read_only_tools = read_only_tools or set()
+        self.calls: list[tuple[str, dict]] = []
+        self.log: list[str] = []
+        self.list_tools_count = 0
+
+    async def list_tools(self) -> list[Tool]:
+        self.list_tools_count += 1
+        return [
+            Tool(
+                name=name,
+                inputSchema={},
+                annotations=ToolAnnotations(readOnlyHint=True),
+            )
+            for name in self.read_only_tools
+        ]
+
+    async def call_tool(self, name: str, arguments: dict, timeout: int) -> list:
+        self.calls.append((name, arguments))
+        self.log.append(f"start {arguments.get('id', name)}")
+        await asyncio.sleep(0.01)
+        if name == "fail":
+            raise asyncio.CancelledError
+        self.log.append(f"end {arguments.get('id', name)}")
+        return [TextContent(type="text", text=f"{name} result")]
+
+
+def make_chunk(**delta_fields) -> ModelResponseStream:
+    return ModelResponseStream(
+        id="chunk", choices=[StreamingChoices(delta=Delta(**delta_fields))]
+    )
+
+
+def make_tool_call_chunk(
+    arguments: str, id: str | None = None, name: str | None = None
+) -> ModelResponseStream:
+    return make_chunk(
+        tool_calls=[
+            ChatCompletionDeltaToolCall(
+                id=id,
+                index=0,
+                type="function",
+                function=Function(name=name, arguments=arguments),
+            )
+        ]
+    )
+
+
+def patch_completion_stream(
+    monkeypatch: pytest.MonkeyPatch, steps: list[list[ModelResponseStream]]
+) -> None:
+    """Make each completion request stream the chunks of the next step."""
+    remaining_steps = iter(steps)
+
+    async def fake_completion_stream(**kwargs):
+        for chunk in next(remaining_steps):
+            yield chunk
+
+    monkeypatch.setattr(
+        agent_module, "litellm_completion_stream", fake_completion_stream
+    )
+
+
+def create_agent(mcp_client: StubMCPClient) -> Agent:
+    return Agent(
+        mcp_client=mcp_client,  # type: ignore[arg-type]
+        config=AgentConfig(),
+        working_directory=Path.cwd(),
+        mcp_instructions="",
+    )
+
+
+async def test_turn_streams_chunks_and_rebuilds_tool_calls(monkeypatch):
+    """Test that thinking is hidden from the streamed chunks and split tool call arguments are merged."""
+    content_deltas = ["<thi", "nk>Let me", " plan</think>", "\n\nHello", " there"]
+    patch_completion_stream(
+        monkeypatch,
+        [
+            [
+                *(
+                    make_chunk(content=delta, role="assistant")
+                    for delta in content_deltas
+                ),
+                make_tool_call_chunk('{"pa', id="call_1", name="view"),
+                make_tool_call_chunk('th": "notes.txt"}'),
+            ],
+            [make_chunk(content="Done", role="assistant")],
+        ],
+    )
+    mcp_client = StubMCPClient()
+    agent = create_agent(mcp_client)
+
+    events = [event async for event in agent.turn("Read my notes")]
+
+    assert [type(event) for event in events] == [
+        AssistantMessageChunk,
+        AssistantMessageData,
+        ToolMessageData,
+        AssistantMessageChunk,
+        AssistantMessageData,
+    ]
+    assert events[0] == AssistantMessageChunk(content="Hello there")
+    assert isinstance(events[1], AssistantMessageData)
+    assert events[1].message == "Hello there"
+    assert events[1].tool_calls[0].args == {"path": "notes.txt"}
+    assert events[2] == ToolMessageData(name="view", id="call_1", content="view result")
+    assert events[3] == AssistantMessageChunk(content="Done")
+    assert mcp_client.calls == [("view", {"path": "notes.txt"})]
+
+
+async def test_turn_separates_tool_calls_with_the_same_index(monkeypatch):
+    """Test that tool calls streamed with the same index, as litellm's Ollama parser does, stay separate calls."""
+    patch_completion_stream(
+        monkeypatch,
+        [
+            [
+                make_chunk(
+                    tool_calls=[
+                        ChatCompletionDeltaToolCall(
+                            id=f"call_{path}",
+                            index=0,
+                            type="function",
+                            function=Function(
+                                name="view", arguments=f'{{"path": "{path}"}}'
+                            ),
+                        )
+                        for path in ["a.txt", "b.txt"]
+                    ]
+                )
+            ],
+            [make_chunk(content="Done")],
+        ],
+    )
+    mcp_client = StubMCPClient(read_only_tools={"view"})
+    agent = create_agent(mcp_client)
+
+    events = [event async for event in agent.turn("Read both")]
+
+    assert isinstance(events[0], AssistantMessageData)
+    assert [tool_call.args for tool_call in events[0].tool_calls] == [
+        {"path": "a.txt"},
+        {"path": "b.txt"},
+    ]
+    assert mcp_client.calls == [
+        ("view", {"path": "a.txt"}),
+        ("view", {"path": "b.txt"}),
+    ]
+
+
+async def test_turn_buffers_streamed_deltas(monkeypatch):
+    """Test that deltas are yielded in buffered chunks rather than one event per token."""
+    deltas = [f"{i} " for i in range(agent_module.STREAM_CHUNK_DELTAS + 2)]
+    patch_completion_stream(
+        monkeypatch, [[make_chunk(content=delta, role="assistant") for delta in deltas]]
+    )
+    agent = create_agent(StubMCPClient())
+
+    events = [event async for event in agent.turn("Count")]
+
+    chunks = [event for event in events if isinstance(event, AssistantMessageChunk)]
+    assert [chunk.content for chunk in chunks] == [
+        "".join(deltas[: agent_module.STREAM_CHUNK_DELTAS]),
+        "".join(deltas[agent_module.STREAM_CHUNK_DELTAS :]),
+    ]
+
+
+async def test_turn_empty_stream(monkeypatch):
+    """Test that a stream without any chunks fails with a clear error."""
+    patch_completion_stream(monkeypatch, [[]])
+    agent = create_agent(StubMCPClient())
+
+    with pytest.raises(ValueError, match="ended without returning any content"):
+        async for _ in agent.turn("Hello"):
+            pass
+
+
+def make_tool_calls(*names: str) -> list[ModelResponseStream]:
+    return [
+        make_chunk(
+            tool_calls=[
+                ChatCompletionDeltaToolCall(
+                    id=f"call_{i}",
+                    index=i,
+                    type="function",
+                    function=Function(name=name, arguments=f'{{"id": "{i}"}}'),
+                )
+            ]
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+async def test_turn_runs_read_only_tool_calls_concurrently(monkeypatch):
+    """Test that consecutive read-only tool calls overlap while other tool calls run in order."""
+    patch_completion_stream(
+        monkeypatch,
+        [
+            make_tool_calls("view", "view", "create", "view"),
+            [make_chunk(content="Done")],
+        ],
+    )
+    mcp_client = StubMCPClient(read_only_tools={"view"})
+    agent = create_agent(mcp_client)
+
+    events = [event async for event in agent.turn("Look around")]
+
+    assert mcp_client.log == [
+        "start 0",
+        "start 1",
+        "end 0",
+        "end 1",
+        "start 2",
+        "end 2",
+        "start 3",
+        "end 3",
+    ]
+    tool_events = [event for event in events if isinstance(event, ToolMessageData)]
+    assert [event.id for event in tool_events] == [f"call_{i}" for i in range(4)]
+
+
+async def test_turn_tool_call_exception(monkeypatch):
+    """Test that a tool call raising a BaseException becomes an error message without affecting the others."""
+    patch_completion_stream(
+        monkeypatch, [make_tool_calls("view", "fail"), [make_chunk(content="Done")]]
+    )
+    mcp_client = StubMCPClient(read_only_tools={"view", "fail"})
+    agent = create_agent(mcp_client)
+
+    events = [event async for event in agent.turn("Look around")]
+
+    tool_events = [event for event in events if isinstance(event, ToolMessageData)]
+    assert tool_events[0].content == "view result"
+    assert tool_events[1].content.startswith("Error executing tool call 'fail'")
+
+
+async def test_turn_lists_tools_once(monkeypatch):
+    """Test that the MCP tools are only listed for the first turn."""
+    patch_completion_stream(
+        monkeypatch, [[make_chunk(content="Hi")], [make_chunk(content="Hi again")]]
+    )
+    mcp_client = StubMCPClient(read_only_tools={"view"})
+    agent = create_agent(mcp_client)
+
+    async for _ in agent.turn("Hello"):
+        pass
+    async for _ in agent.turn("Hello again"):
+        pass
+
+    assert mcp_client.list_tools_count == 1
+
+
+async def test_batch_turn(monkeypatch):
+    """Test that each agent runs its own turn and keeps its own history."""
+    patch_completion_stream(
+        monkeypatch, [[make_chunk(content="First")], [make_chunk(content="Second")]]
+    )
+    agents = [create_agent(StubMCPClient()), create_agent(StubMCPClient())]
+
+    results = await agent_module.batch_turn(agents, ["Hello", "Hi"])
+
+    for events, expected_message in zip(results, ["First", "Second"], strict=True):
+        last_event = events[-1]
+        assert isinstance(last_event, AssistantMessageData)
+        assert last_event.message == expected_message
+    assert [len(agent.message_history.messages) for agent in agents] == [3, 3]
@@ -0,0 +1,64 @@
+import asyncio
+
+from ai_core.litelllm_completion import litellm_completion_stream
+
+
+async def test_completion_stream_limits_concurrent_requests(monkeypatch):
+    """Test that streams of the same model wait for a free slot until earlier streams are consumed."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_stream():
+        nonlocal in_flight
+        for i in range(3):
+            await asyncio.sleep(0.01)
+            yield i
+        in_flight -= 1
+
+    async def fake_acompletion(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        return fake_stream()
+
+    monkeypatch.setattr("litellm.acompletion", fake_acompletion)
+
+    async def consume() -> list:
+        return [
+            chunk
+            async for chunk in litellm_completion_stream(
+                model="test-model", messages=[], max_concurrent_requests=2
+            )
+        ]
+
+    results = await asyncio.gather(*(consume() for _ in range(5)))
+
+    assert results == [[0, 1, 2]] * 5
+    assert max_in_flight == 2
+
+
+def test_completion_stream_works_across_event_loops(monkeypatch):
+    """Test that the per model limit does not tie requests to the first event loop that used it."""
+
+    async def fake_stream():
+        await asyncio.sleep(0.01)
+        yield "chunk"
+
+    async def fake_acompletion(**kwargs):
+        return fake_stream()
+
+    monkeypatch.setattr("litellm.acompletion", fake_acompletion)
+
+    async def consume() -> list:
+        return [
+            chunk
+            async for chunk in litellm_completion_stream(
+                model="loop-test-model", messages=[], max_concurrent_requests=1
+            )
+        ]
+
+    async def run_batch() -> list:
+        return await asyncio.gather(*(consume() for _ in range(3)))
+
+    assert asyncio.run(run_batch()) == [["chunk"]] * 3
+    assert asyncio.run(run_batch()) == [["chunk"]] * 3
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from ai_core.config import AgentConfig
+from ai_core.mcp_client import initialize_mcp_client
+from ai_core.mcp_pool import MCPSessionPool
+
+
+async def test_initialize_mcp_client_reuses_composed_server(tmp_path: Path):
+    """Test that clients for the same config share the composed server."""
+    config = AgentConfig(native_mcp_servers={"filesystem"})
+    other_workspace = tmp_path / "other"
+    other_workspace.mkdir()
+
+    async with MCPSessionPool() as session_pool:
+        client, instructions = await initialize_mcp_client(
+            tmp_path, config, session_pool
+        )
+        other_client, other_instructions = await initialize_mcp_client(
+            other_workspace, config, session_pool
+        )
+
+        assert len(session_pool.composed_servers) == 1
+        assert other_instructions == instructions
+        async with client, other_client:
+            assert [tool.name for tool in await other_client.list_tools()] == [
+                tool.name for tool in await client.list_tools()
+            ]
@@ -0,0 +1,22 @@
+import sys
+
+from ai_core.mcp_pool import MCPSessionPool
+
+WEB_SERVER_CONFIG = {
+    "mcpServers": {
+        "web": {
+            "command": sys.executable,
+            "args": ["-m", "ai_core.mcp_servers.web.server"],
+        }
+    }
+}
+
+
+async def test_acquire_reuses_connected_client():
+    """Test that acquiring the same server twice returns the same connected client."""
+    async with MCPSessionPool() as session_pool:
+        client = await session_pool.acquire("web", WEB_SERVER_CONFIG)
+        assert client.is_connected()
+        assert await session_pool.acquire("web", WEB_SERVER_CONFIG) is client
+
+    assert not client.is_connected()
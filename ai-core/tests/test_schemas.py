@@ -0,0 +1,105 @@
+from ai_core.schemas import Message, MessageHistory
+
+
+def make_message(role: str, content: str) -> Message:
+    param = {"role": role, "content": content}
+    if role == "tool":
+        param["tool_call_id"] = content
+    return Message(chat_completion_message_param=param)  # type: ignore[arg-type]
+
+
+def contents(messages: list[dict]) -> list[str]:
+    return [message["content"] for message in messages]
+
+
+def test_get_messages_without_window():
+    """Test that the entire conversation is sent when there is no window."""
+    history = MessageHistory(
+        messages=[make_message("system", "s")]
+        + [make_message("user", str(i)) for i in range(10)]
+    )
+    assert contents(history.get_messages()) == ["s", *(str(i) for i in range(10))]
+
+
+def test_get_messages_expanding_window():
+    """Test that the window grows to twice its size before restarting, always keeping the system prompt."""
+    history = MessageHistory(messages=[make_message("system", "s")], window_size=2)
+
+    sent = []
+    for i in range(6):
+        history.messages.append(make_message("user", str(i)))
+        sent.append(contents(history.get_messages()))
+
+    assert sent == [
+        ["s", "0"],
+        ["s", "0", "1"],
+        ["s", "0", "1", "2"],
+        ["s", "0", "1", "2", "3"],
+        ["s", "3", "4"],
+        ["s", "3", "4", "5"],
+    ]
+
+
+def test_get_messages_window_keeps_tool_calls():
+    """Test that the window never starts on a tool result, but on the assistant message that called the tool."""
+    history = MessageHistory(
+        messages=[
+            make_message("system", "s"),
+            make_message("user", "u"),
+            make_message("assistant", "a"),
+            make_message("tool", "t1"),
+            make_message("tool", "t2"),
+            make_message("assistant", "done"),
+        ],
+        window_size=2,
+    )
+    assert contents(history.get_messages()) == ["s", "a", "t1", "t2", "done"]
+
+
+def test_get_messages_window_ending_in_tool_results():
+    """Test that a history ending in tool results still sends the assistant message that called the tools."""
+    history = MessageHistory(
+        messages=[
+            make_message("system", "s"),
+            make_message("user", "u0"),
+            make_message("user", "u1"),
+            make_message("assistant", "a"),
+            make_message("tool", "t1"),
+            make_message("tool", "t2"),
+        ],
+        window_size=2,
+    )
+    assert contents(history.get_messages()) == ["s", "a", "t1", "t2"]
+
+    history = MessageHistory(
+        messages=[
+            make_message("system", "s"),
+            make_message("user", "u"),
+            make_message("assistant", "a"),
+            make_message("tool", "t1"),
+        ],
+        window_size=1,
+    )
+    assert contents(history.get_messages()) == ["s", "a", "t1"]
+
+
+def test_get_messages_converts_each_message_once():
+    """Test that later requests reuse the converted messages and include new ones."""
+    history = MessageHistory(messages=[make_message("system", "s")])
+    first = history.get_messages()
+    history.messages.append(make_message("user", "u"))
+    second = history.get_messages()
+
+    assert contents(second) == ["s", "u"]
+    assert second[0] is first[0]
+    assert second is not history.get_messages()
+
+
+def test_message_defaults_are_per_message():
+    """Test that each message gets its own id and creation time."""
+    first = make_message("user", "first")
+    second = make_message("user", "second")
+
+    assert first.message_id != second.message_id
+    assert first.timestamp <= second.timestamp
+    assert first.timestamp is not second.timestamp
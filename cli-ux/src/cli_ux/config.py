@@ -6,6 +6,13 @@ from ai_core.config import AgentConfig
 from pydantic import BaseModel, Field
 import yaml
 
+# Use the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 
 class UXConfig(BaseModel):
     number_tool_lines: int = Field(
@@ -53,7 +60,7 @@ def load_config() -> CLIConfig:
 
     try:
         with config_path.open("r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=SafeLoader)
 
         if not config_data:
             return create_default_config()
@@ -76,4 +83,6 @@ def save_config(config: CLIConfig) -> None:
 
     config_dict = config.model_dump()
     with config_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config_dict, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(
+            config_dict, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False
+        )
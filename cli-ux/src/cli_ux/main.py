@@ -7,14 +7,17 @@ import warnings
 
 from ai_core.agent import Agent
 from ai_core.mcp_client import initialize_mcp_client
+from ai_core.mcp_pool import MCPSessionPool
 import click
 from rich.console import Console
 from rich.markdown import Markdown
+from rich.markup import escape
 from rich.prompt import Prompt
 from rich.table import Table
 
 from cli_ux.config import CLIConfig, load_config
 from cli_ux.schemas import (
+    AssistantResponseChunk,
     AssistantResponseMessage,
     EventBus,
     MessageEvent,
@@ -29,24 +32,34 @@ from cli_ux.ux_utils import (
     initial_message,
 )
 
-config = load_config()
-
 warnings.filterwarnings("ignore")
 logging.getLogger().setLevel(logging.CRITICAL)
 
 console = Console(width=120)
 
-event_bus = EventBus(config=config)
-
 # Store tool calls to link with tool messages
 _tool_calls_cache: dict[str, ToolCall] = {}
 
+# Content of the assistant message that is still streaming, previewed in the status line
+_streaming_message: list[str] = []
+
+
+def get_streaming_preview(max_length: int = 100) -> str:
+    """Get the last line of the streaming assistant message, truncated from the left."""
+    lines = "".join(_streaming_message).strip().splitlines()
+    return lines[-1][-max_length:] if lines else ""
+
 
 def handle_event(event: MessageEvent, config: CLIConfig) -> None:
     """Handle events (assistant outputs) by displaying them in the console."""
     if isinstance(event, UserMessage):
+        _streaming_message.clear()
         console.print()
+    elif isinstance(event, AssistantResponseChunk):
+        _streaming_message.append(event.content)
     elif isinstance(event, AssistantResponseMessage):
+        # The complete message replaces the streaming preview
+        _streaming_message.clear()
         # Cache tool calls for later linking with tool messages
         for tool_call in event.tool_calls:
             _tool_calls_cache[tool_call.id] = tool_call
@@ -61,78 +74,83 @@ def handle_event(event: MessageEvent, config: CLIConfig) -> None:
             console.print(table)
             console.print()
     elif isinstance(event, ToolMessage):
-        # Get tool arguments from cached tool call
-        tool_call = _tool_calls_cache.get(event.id)
+        # Get tool arguments from cached tool call, which is done once its result arrives
+        tool_call = _tool_calls_cache.pop(event.id, None)
         args_display = (
             format_tool_arguments(tool_call.args, config.ux_config.max_arg_value_length)
             if tool_call
             else "()"
         )
-        console.print(f"[green]●[/green] {event.name}{args_display}")
-
-        lines = event.content.split("\n")
         max_lines = config.ux_config.number_tool_lines
-        # Show all lines if config is -1, otherwise limit to configured amount
-        num_lines = len(lines) if max_lines == -1 else min(max_lines, len(lines))
-
-        for i, line in enumerate(lines[:num_lines]):
-            prefix = "  ⎿  " if i == 0 else "     "
-            console.print(f"{prefix}{line.strip()}")
-        console.print()
-
-
-event_bus.subscribe(handle_event)
+        # Show all lines if config is -1, otherwise only split off the configured amount
+        lines = event.content.split("\n", max_lines)
+        if max_lines != -1:
+            lines = lines[:max_lines]
+
+        # Rich buffers the prints inside its context and writes them to the terminal at once
+        with console:
+            console.print(f"[green]●[/green] {event.name}{args_display}")
+            for i, line in enumerate(lines):
+                prefix = "  ⎿  " if i == 0 else "     "
+                console.print(f"{prefix}{line.strip()}")
+            console.print()
 
 
 @click.command()
 def chat():
     working_dir = Path.cwd()
+    # Loaded here rather than at import so that --help does not read or create the config file
+    config = load_config()
+    event_bus = EventBus(config=config)
+    event_bus.subscribe(handle_event)
 
     async def setup_and_chat():
-        with console.status(
-            "🔧 [bold blue]Initializing TinkerTasker MCP Client...[/bold blue]",
-            spinner="dots",
-        ):
-            mcp_client, mcp_instructions = await initialize_mcp_client(
-                working_dir, config.agent_config
-            )
-        async with mcp_client:
-            click.clear()
+        # The session pool keeps external MCP servers connected for the whole chat
+        async with MCPSessionPool() as session_pool:
             with console.status(
-                "🔧 [bold blue]Initializing TinkerTasker Tools...[/bold blue]",
+                "🔧 [bold blue]Initializing TinkerTasker MCP Client...[/bold blue]",
                 spinner="dots",
             ):
-                # This list tools is necessary to ensure the MCP servers are pre-initialized rather than waiting for the first list call.
-                await mcp_client.list_tools()
-            # These clears and initialization are required because initializing the MCP servers outputs stuff to console from other processes.
-            click.clear()
-
-            initial_message(working_dir, console, config.agent_config)
-            agent = Agent(
-                mcp_client=mcp_client,
-                config=config.agent_config,
-                working_directory=working_dir,
-                mcp_instructions=mcp_instructions,
-            )
-            while True:
-                try:
-                    user_input = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: Prompt.ask("[bold green]>[/bold green]")
-                    )
-                    user_input = user_input.strip()
-                    if user_input.lower() in ["quit", "exit"]:
+                mcp_client, mcp_instructions = await initialize_mcp_client(
+                    working_dir, config.agent_config, session_pool
+                )
+            async with mcp_client:
+                click.clear()
+                with console.status(
+                    "🔧 [bold blue]Initializing TinkerTasker Tools...[/bold blue]",
+                    spinner="dots",
+                ):
+                    # This list tools is necessary to ensure the MCP servers are pre-initialized rather than waiting for the first list call.
+                    await mcp_client.list_tools()
+                # These clears and initialization are required because initializing the MCP servers outputs stuff to console from other processes.
+                click.clear()
+
+                initial_message(working_dir, console, config.agent_config)
+                agent = Agent(
+                    mcp_client=mcp_client,
+                    config=config.agent_config,
+                    working_directory=working_dir,
+                    mcp_instructions=mcp_instructions,
+                )
+                while True:
+                    try:
+                        user_input = await asyncio.to_thread(
+                            Prompt.ask, "[bold green]>[/bold green]"
+                        )
+                        user_input = user_input.strip()
+                        if user_input.lower() in ["quit", "exit"]:
+                            break
+                        if not user_input:
+                            continue
+                        await process_user_message(user_input, agent, event_bus)
+
+                    except KeyboardInterrupt:
+                        break
+                    except EOFError:
+                        break
+                    except Exception as e:
+                        console.print(f"\n[red]Error: {e}[/red]")
                         break
-                    if not user_input.strip():
-                        continue
-                    await process_user_message(user_input, agent)
-
-                except KeyboardInterrupt:
-                    break
-                except EOFError:
-                    break
-                except Exception as e:
-                    console.print(f"\n[red]Error: {e}[/red]")
-                    break
 
     try:
         asyncio.run(setup_and_chat())
@@ -140,18 +158,24 @@ def chat():
         console.print("[green]Goodbye![/green]")
 
 
-async def process_user_message(user_input: str, agent: Agent) -> None:
+async def process_user_message(
+    user_input: str, agent: Agent, event_bus: EventBus
+) -> None:
     """Process user message using EventBus and TurnContext."""
     with console.status(
         "working... (0.0s ctrl+c to interrupt)", spinner="dots"
     ) as status:
-        start_time = time.time()
+        start_time = time.monotonic()
 
         async def update_status():
             while True:
-                elapsed = time.time() - start_time
-                status.update(f"working... ({elapsed:.1f}s ctrl+c to interrupt)")
-                await asyncio.sleep(0)
+                elapsed = time.monotonic() - start_time
+                status_text = f"working... ({elapsed:.1f}s ctrl+c to interrupt)"
+                if preview := get_streaming_preview():
+                    status_text = f"[dim]● {escape(preview)}[/dim]\n{status_text}"
+                status.update(status_text)
+                # Rich redraws the status about 12 times a second, so updating more often only burns CPU
+                await asyncio.sleep(0.1)
 
         status_task = asyncio.create_task(update_status())
 
@@ -22,13 +22,19 @@ class AssistantResponseMessage(BaseModel):
     tool_calls: list[ToolCall] = []
 
 
+class AssistantResponseChunk(BaseModel):
+    content: str
+
+
 class ToolMessage(BaseModel):
     name: str
     id: str
     content: str
 
 
-MessageEvent = UserMessage | AssistantResponseMessage | ToolMessage
+MessageEvent = (
+    UserMessage | AssistantResponseMessage | AssistantResponseChunk | ToolMessage
+)
 
 
 class EventBus:
@@ -55,7 +61,7 @@ class TurnContext:
         self.is_processing = False
 
     async def __aenter__(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.is_processing = True
         return self
 
@@ -66,4 +72,4 @@ class TurnContext:
         self.event_bus.publish(event)
 
     def get_elapsed_time(self) -> float:
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
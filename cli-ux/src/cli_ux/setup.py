@@ -34,24 +34,24 @@ def run_crawl4ai_setup() -> None:
 
         logger.info(f"Added to PATH: {scripts_dir}")
 
-        result = subprocess.run(
+        process = subprocess.Popen(
             ["crawl4ai-setup"],
-            check=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
             shell=sys.platform == "win32",
             env=env,
         )
+        # Stream the output so that browser download progress shows up as it happens
+        with process:
+            for line in process.stdout or []:
+                print(line, end="")
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
         logger.success("crawl4ai-setup completed successfully")
-        if result.stdout:
-            print(result.stdout)
 
     except subprocess.CalledProcessError as err:
         logger.error(f"crawl4ai-setup failed with exit code {err.returncode}")
-        if err.stdout:
-            print("STDOUT:", err.stdout)
-        if err.stderr:
-            print("STDERR:", err.stderr)
         sys.exit(1)
 
     except FileNotFoundError:
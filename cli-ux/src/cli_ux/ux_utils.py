@@ -3,12 +3,23 @@ import json
 from pathlib import Path
 
 from ai_core.config import AgentConfig
-from ai_core.schemas import AssistantMessageData, MessageData, ToolMessageData
+from ai_core.schemas import (
+    AssistantMessageChunk,
+    AssistantMessageData,
+    MessageData,
+    ToolMessageData,
+)
 from rich.console import Console
 from rich.panel import Panel
 
 from cli_ux.config import get_config_path
-from cli_ux.schemas import AssistantResponseMessage, MessageEvent, ToolCall, ToolMessage
+from cli_ux.schemas import (
+    AssistantResponseChunk,
+    AssistantResponseMessage,
+    MessageEvent,
+    ToolCall,
+    ToolMessage,
+)
 
 
 def initial_message(
@@ -52,7 +63,11 @@ def format_tool_arguments(args: str, max_arg_value_length: int = 50) -> str:
         for key, value in parsed_args.items():
             # Convert to string and normalize whitespace
             value_str = str(value)
-            cleaned_value = " ".join(value_str.split())
+            # Normalizing the start of a long value (e.g. a whole file) gives the same start as normalizing all of it,
+            # so only fall back to the full value if the start is mostly whitespace and ends up too short
+            cleaned_value = " ".join(value_str[: 4 * max_arg_value_length].split())
+            if len(cleaned_value) <= max_arg_value_length:
+                cleaned_value = " ".join(value_str.split())
 
             # Truncate if needed
             truncated_value = (
@@ -69,8 +84,8 @@ def format_tool_arguments(args: str, max_arg_value_length: int = 50) -> str:
 
         return f"({', '.join(formatted_pairs)})"
 
-    # Try parsing with ast.literal_eval first, then JSON
-    for parser in [ast.literal_eval, json.loads]:
+    # Try parsing as JSON first since that is what the agent's tool calls are, then as a Python literal
+    for parser in [json.loads, ast.literal_eval]:
         try:
             parsed_args = parser(args)
             return format_parsed_args(parsed_args)
@@ -85,10 +100,12 @@ def convert_data_to_event(data: MessageData) -> MessageEvent:
     """Convert MessageData schemas from the ai core Agent to the cli's MessageEvent schemas."""
     if isinstance(data, AssistantMessageData):
         tool_calls = [
-            ToolCall(name=tc.name, id=tc.id, args=str(tc.args))
+            ToolCall(name=tc.name, id=tc.id, args=json.dumps(tc.args))
             for tc in data.tool_calls
         ]
         return AssistantResponseMessage(message=data.message, tool_calls=tool_calls)
+    elif isinstance(data, AssistantMessageChunk):
+        return AssistantResponseChunk(content=data.content)
     elif isinstance(data, ToolMessageData):
         return ToolMessage(name=data.name, id=data.id, content=data.content)
     else: